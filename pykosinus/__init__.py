@@ -3,7 +3,7 @@ VERSION = "0.2.0"
 import hashlib
 import logging
 import os
-from typing import Any, Callable, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
 from pydantic import BaseModel, Field
 
@@ -30,7 +30,9 @@ class Conf:
     model_location: str
     cosine_index_location: str
     sparse_index_location: str
+    compact_index_location: str
     pickle_index_location: str
+    shared_index_location: str
     spellchecker_dictionary: str
 
     @staticmethod
@@ -59,9 +61,13 @@ class Conf:
         conf.sparse_index_location = os.path.join(
             base_path, conf.storage, "model.sparse.index"
         )
+        conf.compact_index_location = os.path.join(
+            base_path, conf.storage, "model.compact.npz"
+        )
         conf.pickle_index_location = os.path.join(
             base_path, conf.storage, "model.pickle"
         )
+        conf.shared_index_location = os.path.join(base_path, conf.storage, "shared")
         conf.spellchecker_dictionary = os.path.join(
             base_path, conf.storage, "spell_dictionary.txt"
         )
@@ -83,6 +89,14 @@ class ScoringContent(BaseModel):
     score: float
 
 
+class IndexStats(BaseModel):
+    collection: str
+    precision: str
+    rows: Dict[str, Dict[str, int]]
+    artifacts: Dict[str, int]
+    resident_memory: Optional[int] = Field(default=None)
+
+
 class Task:
     def __init__(
         self,
@@ -2,13 +2,19 @@ import contextlib
 import re
 from copy import deepcopy
 from os import path, remove
-from typing import Any, Generator, List, Optional
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 
 from pykosinus import Conf, Constant, Content, ScoringContent
 
 
 class BaseScoring:
     conf: Conf
+    variants: Tuple[Tuple[str, str, str], ...] = (
+        ("all_special_char", Constant.ALL_SPECIAL_CHAR_REGEX, ""),
+        ("special_char", Constant.SPECIAL_CHAR_REGEX, ""),
+        ("whitespace_replacement", Constant.WHITESPACE_REPLACEMENT_REGEX, " "),
+        ("hyphen", r"-", ""),
+    )
 
     def compile_content(
         self, contents: List[Content], include_whitespace: bool = True
@@ -40,13 +46,34 @@ class BaseScoring:
                             return [_sc]
                     return []
 
-                _results += add_formating(Constant.ALL_SPECIAL_CHAR_REGEX)
-                _results += add_formating(Constant.SPECIAL_CHAR_REGEX)
-                _results += add_formating(Constant.WHITESPACE_REPLACEMENT_REGEX, " ")
-                _results += add_formating(r"-")
+                for _, regex, replacement in self.variants:
+                    _results += add_formating(regex, replacement)
                 results += _results
         return results
 
+    def count_variants(
+        self, contents: Iterable[ScoringContent], include_whitespace: bool = True
+    ) -> Dict[str, int]:
+        def formated(text: str) -> str:
+            return text if include_whitespace else text.replace(" ", "")
+
+        counts = dict.fromkeys(["original"] + [i[0] for i in self.variants], 0)
+        for content in contents:
+            text = content.original.strip().lower()
+            variant = "original"
+            if content.content != formated(text):
+                variant = next(
+                    (
+                        name
+                        for name, regex, replacement in self.variants
+                        if formated(re.sub(regex, replacement, text).strip())
+                        == content.content
+                    ),
+                    variant,
+                )
+            counts[variant] += 1
+        return counts
+
     def __init__(self, collection_name: str, batch_length: Optional[int] = 500) -> None:
         self.conf = Conf.get_config(collection_name, batch_length)
 
@@ -83,6 +110,22 @@ class BaseScoring:
     def is_partial_indexed(self) -> bool:
         return path.exists(path.join(self.conf.storage, ".part.indexed"))
 
+    @staticmethod
+    def _merge_best_score(
+        results: List[ScoringContent], content: ScoringContent
+    ) -> None:
+        if existing_content := next(
+            (c for c in results if c.identifier == content.identifier),
+            None,
+        ):
+            if content.score > existing_content.score:
+                existing_content.score = content.score
+                existing_content.content = content.content
+                existing_content.section = content.section
+                existing_content.original = content.original
+        else:
+            results.append(content)
+
     @staticmethod
     def _batch_generator(
         data: List[Any], batch_size: int
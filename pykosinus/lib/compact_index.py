@@ -0,0 +1,152 @@
+import contextlib
+import zipfile
+from os import path, remove, replace
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class CompactIndex:
+    """
+    Term-major posting list of normalized TF-IDF vectors.
+
+    Rows are stored as int32 indices next to float32, float16 or 8-bit
+    quantized weights. Only 8-bit weights carry a float32 scale per row, they
+    are dequantized on the fly while scoring. ``shape`` holds the row count.
+    Like a gensim similarity index, ``index[query]`` returns the cosine
+    similarity of every row.
+    """
+
+    PRECISIONS = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+    ARRAYS = ("indptr", "rows", "weights", "scales", "shape")
+
+    indptr: np.ndarray
+    rows: np.ndarray
+    weights: np.ndarray
+    scales: np.ndarray
+    shape: np.ndarray
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        rows: np.ndarray,
+        weights: np.ndarray,
+        scales: np.ndarray,
+        shape: np.ndarray,
+    ) -> None:
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+        self.scales = scales
+        self.shape = shape
+
+    @property
+    def precision(self) -> str:
+        return np.dtype(self.weights.dtype).name
+
+    @property
+    def num_rows(self) -> int:
+        return int(self.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    @classmethod
+    def build(
+        cls,
+        vectors: Iterable[List[Tuple[int, float]]],
+        num_terms: int,
+        precision: str = "float32",
+    ) -> "CompactIndex":
+        if precision not in cls.PRECISIONS:
+            raise ValueError(
+                f"CompactIndex precision must be one of {', '.join(cls.PRECISIONS)}, got '{precision}'."
+            )
+
+        terms, rows, weights, scales = [], [], [], []
+        num_rows = 0
+        for row, vector in enumerate(vectors):
+            num_rows += 1
+            if precision == "int8":
+                scale = max((abs(weight) for _, weight in vector), default=0.0)
+                scales.append(scale / 127 or 1.0)
+            for term, weight in vector:
+                terms.append(term)
+                rows.append(row)
+                weights.append(weight)
+
+        terms = np.array(terms, dtype=np.int32)
+        rows = np.array(rows, dtype=np.int32)
+        weights = np.array(weights, dtype=np.float32)
+        scales = np.array(scales, dtype=np.float32)
+        if precision == "int8":
+            weights = np.rint(weights / scales[rows])
+
+        order = np.argsort(terms, kind="stable")
+        indptr = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=num_terms), out=indptr[1:])
+        return cls(
+            indptr,
+            rows[order],
+            weights[order].astype(cls.PRECISIONS[precision]),
+            scales,
+            np.array([num_rows], dtype=np.int64),
+        )
+
+    @classmethod
+    def load(cls, location: str) -> "CompactIndex":
+        with np.load(location) as archive:
+            return cls(*(archive[name] for name in cls.ARRAYS))
+
+    @classmethod
+    def load_arrays(cls, prefix: str, mmap_mode: Optional[str] = "r") -> "CompactIndex":
+        return cls(
+            *(
+                np.load(f"{prefix}.{name}.npy", mmap_mode=mmap_mode)
+                for name in cls.ARRAYS
+            )
+        )
+
+    @classmethod
+    def read_precision(cls, location: str) -> str:
+        # only parse the header of the weights array, not the array itself.
+        with zipfile.ZipFile(location) as archive:
+            with archive.open("weights.npy") as file:
+                version = np.lib.format.read_magic(file)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(file)
+                else:
+                    header = np.lib.format.read_array_header_2_0(file)
+        return np.dtype(header[2]).name
+
+    @classmethod
+    def exists(cls, location: str) -> bool:
+        return path.exists(location)
+
+    @classmethod
+    def delete(cls, location: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            remove(location)
+
+    def save(self, location: str) -> None:
+        # one archive swapped in atomically, readers never see a mix of arrays.
+        with open(f"{location}.tmp", "wb") as file:
+            np.savez(file, **{name: getattr(self, name) for name in self.ARRAYS})
+        replace(f"{location}.tmp", location)
+
+    def save_arrays(self, prefix: str) -> None:
+        for name in self.ARRAYS:
+            np.save(f"{prefix}.{name}.npy", getattr(self, name))
+
+    def __getitem__(self, query: List[Tuple[int, float]]) -> np.ndarray:
+        sims = np.zeros(self.num_rows, dtype=np.float32)
+        quantized = self.weights.dtype == np.int8
+        for term, weight in query:
+            start, end = self.indptr[term], self.indptr[term + 1]
+            rows = self.rows[start:end]
+            weights = self.weights[start:end].astype(np.float32)
+            if quantized:
+                weights *= self.scales[rows]
+            sims[rows] += weight * weights
+        return sims
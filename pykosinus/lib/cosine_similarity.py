@@ -3,16 +3,31 @@ import pickle
 import time
 from copy import deepcopy
 from os import path, remove
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 
 from gensim import corpora, models, similarities
 
 from pykosinus import Content, ScoringContent, log
 from pykosinus.lib import BaseScoring
+from pykosinus.lib.compact_index import CompactIndex
 
 
 class CosineSimilarity(BaseScoring):
     _contents: List[Content]
+    precision: Optional[str]
+
+    def __init__(
+        self,
+        collection_name: str,
+        batch_length: Optional[int] = 500,
+        precision: Optional[str] = None,
+    ) -> None:
+        super().__init__(collection_name, batch_length)
+        if precision is not None and precision not in CompactIndex.PRECISIONS:
+            raise ValueError(
+                f"CosineSimilarity precision must be one of {', '.join(CompactIndex.PRECISIONS)}, got '{precision}'."
+            )
+        self.precision = precision
 
     def search(self, keyword: str, threshold: float = 0.4) -> List[ScoringContent]:
         st = time.time()
@@ -40,22 +55,12 @@ class CosineSimilarity(BaseScoring):
             if sim >= threshold:
                 content = scoring_content[i]
                 content.score = sim
-
-                if existing_content := next(
-                    (c for c in results if c.identifier == content.identifier),
-                    None,
-                ):
-                    if content.score > existing_content.score:
-                        existing_content.score = content.score
-                        existing_content.content = content.content
-                        existing_content.section = content.section
-                        existing_content.original = content.original
-                else:
-                    results.append(content)
+                self._merge_best_score(results, content)
 
     def create_index(self, contents: List[Content], update: bool = False):
         st = time.time()
         scoring_content = self.compile_content(contents)
+        precision = self.precision
 
         if update:
             if not self.is_filling():
@@ -65,6 +70,7 @@ class CosineSimilarity(BaseScoring):
                 return log.warning("CosineSimilarity.create_index cancel for updating.")
 
             _scoring_content = indexs[0]
+            precision = precision or self.index_precision(indexs[3])
             for content in deepcopy(scoring_content):
                 if content not in _scoring_content:
                     _scoring_content.append(content)
@@ -75,9 +81,14 @@ class CosineSimilarity(BaseScoring):
         dictionary = corpora.Dictionary((text.split() for text in objects_list))
         corpus = [dictionary.doc2bow(text.split()) for text in objects_list]
         tfidf = models.TfidfModel(corpus)
-        cosine = similarities.Similarity(
-            None, tfidf[corpus], num_features=len(dictionary)
-        )
+        cosine: Union[similarities.Similarity, CompactIndex]
+        precision = precision or self.stored_precision
+        if precision == "float32":
+            cosine = similarities.Similarity(
+                None, tfidf[corpus], num_features=len(dictionary)
+            )
+        else:
+            cosine = CompactIndex.build(tfidf[corpus], len(dictionary), precision)
         log.debug(
             f"generate CosineSimilarity model finish in {round(time.time() - st, 3)} seconds."
         )
@@ -87,11 +98,20 @@ class CosineSimilarity(BaseScoring):
             return
 
         self.filling()
+        # drop the other format first, it must never be read with the new dictionary.
+        if isinstance(cosine, CompactIndex):
+            with contextlib.suppress(FileNotFoundError):
+                remove(self.conf.cosine_index_location)
+        else:
+            CompactIndex.delete(self.conf.compact_index_location)
         with open(self.conf.score_contents, "wb") as file:
             pickle.dump(scoring_content, file)
         dictionary.save(self.conf.dictionary_location)
         tfidf.save(self.conf.model_location)
-        cosine.save(self.conf.cosine_index_location)
+        if isinstance(cosine, CompactIndex):
+            cosine.save(self.conf.compact_index_location)
+        else:
+            cosine.save(self.conf.cosine_index_location)
         self.filling(True)
         log.debug(
             f"save CosineSimilarity model finished in {round(time.time() - st, 3)} seconds."
@@ -104,7 +124,7 @@ class CosineSimilarity(BaseScoring):
             List[ScoringContent],
             corpora.Dictionary,
             models.TfidfModel,
-            similarities.Similarity,
+            Union[similarities.Similarity, CompactIndex],
         ]
     ]:
         result = None
@@ -113,7 +133,10 @@ class CosineSimilarity(BaseScoring):
                 scoring_content: List[ScoringContent] = pickle.load(file)
             dictionary = corpora.Dictionary.load(self.conf.dictionary_location)
             tfidf = models.TfidfModel.load(self.conf.model_location)
-            cosine = similarities.Similarity.load(self.conf.cosine_index_location)
+            if CompactIndex.exists(self.conf.compact_index_location):
+                cosine = CompactIndex.load(self.conf.compact_index_location)
+            else:
+                cosine = similarities.Similarity.load(self.conf.cosine_index_location)
             result = (scoring_content, dictionary, tfidf, cosine)
         if not result and waiting and retry > 0:
             time.sleep(1)
@@ -124,6 +147,23 @@ class CosineSimilarity(BaseScoring):
             )
         return result
 
+    def shard_locations(self) -> List[str]:
+        # shards drop their matrix when pickled, so this only reads the paths.
+        with contextlib.suppress(FileNotFoundError, pickle.UnpicklingError):
+            cosine = similarities.Similarity.load(self.conf.cosine_index_location)
+            return [shard.fullname() for shard in cosine.shards]
+        return []
+
+    @property
+    def stored_precision(self) -> str:
+        if CompactIndex.exists(self.conf.compact_index_location):
+            return CompactIndex.read_precision(self.conf.compact_index_location)
+        return "float32"
+
+    @staticmethod
+    def index_precision(cosine: Union[similarities.Similarity, CompactIndex]) -> str:
+        return cosine.precision if isinstance(cosine, CompactIndex) else "float32"
+
     def filling(self, end: bool = False) -> None:
         if end:
             with contextlib.suppress(FileNotFoundError):
@@ -3,7 +3,7 @@ import pickle
 import time
 from copy import deepcopy
 from os import path, remove
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from fuzzywuzzy import fuzz
 
@@ -18,7 +18,7 @@ class FuzzyMatch(BaseScoring):
         if keyword := keyword.lower().replace(" ", ""):
             if indexs := self.get_index():
                 for index in indexs:
-                    sim = float(fuzz.ratio(keyword, index.content) / 100) - 0.05
+                    sim = self.similarity(keyword, index.content)
                     if sim >= threshold:
                         index.score = sim
                         results.append(index)
@@ -28,6 +28,10 @@ class FuzzyMatch(BaseScoring):
         )
         return sorted(results, key=lambda obj: obj.score, reverse=True)
 
+    @staticmethod
+    def similarity(keyword: str, text: str) -> float:
+        return float(fuzz.ratio(keyword, text) / 100) - 0.05
+
     def create_index(self, contents: List[Content], update: bool = False) -> None:
         st = time.time()
         scoring_content = self.compile_content(contents)
@@ -81,6 +85,9 @@ class FuzzyMatch(BaseScoring):
     def compile_content(self, contents: List[Content]) -> List[ScoringContent]:
         return super().compile_content(contents, False)
 
+    def count_variants(self, contents: Iterable[ScoringContent]) -> Dict[str, int]:
+        return super().count_variants(contents, False)
+
     def filling(self, end: bool = False) -> None:
         if end:
             with contextlib.suppress(FileNotFoundError):
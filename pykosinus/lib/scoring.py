@@ -1,10 +1,15 @@
+import contextlib
+import os
+import sys
 import time
+from os import path
 from typing import List, Optional
 
-from pykosinus import Content, ScoringContent, log
+from pykosinus import Content, IndexStats, ScoringContent, log
 from pykosinus.lib import BaseScoring
 from pykosinus.lib.cosine_similarity import CosineSimilarity
 from pykosinus.lib.fuzzy_match import FuzzyMatch
+from pykosinus.lib.shared_index import SharedIndex
 from pykosinus.lib.spellcheck import SpellCheck
 
 
@@ -12,6 +17,7 @@ class TextScoring(BaseScoring):
     _contents: List[Content]
     cosine_similarity: CosineSimilarity
     fuzzy_match: FuzzyMatch
+    shared_index: SharedIndex
     spell: SpellCheck
 
     def __init__(
@@ -20,14 +26,21 @@ class TextScoring(BaseScoring):
         fuzz: bool = False,
         spellcheck: bool = True,
         batch_length: Optional[int] = 500,
+        shared: bool = False,
+        precision: Optional[str] = None,
     ) -> None:
         super().__init__(collection_name, batch_length)
         self._contents = []
 
-        self.cosine_similarity = CosineSimilarity(collection_name, batch_length)
+        self.cosine_similarity = CosineSimilarity(
+            collection_name, batch_length, precision
+        )
         if fuzz:
             self.fuzzy_match = FuzzyMatch(collection_name, batch_length)
 
+        if shared:
+            self.shared_index = SharedIndex(collection_name, batch_length)
+
         if spellcheck:
             self.spell = SpellCheck(collection_name)
 
@@ -38,10 +51,20 @@ class TextScoring(BaseScoring):
         if hasattr(self, "spell") and spelling_correction:
             keyword = self.spell.correction(keyword)
 
-        results = self.cosine_similarity.search(keyword, threshold)
-
+        cosine_search = self.cosine_similarity.search
+        fuzzy_search = None
         if hasattr(self, "fuzzy_match"):
-            for content in self.fuzzy_match.search(keyword, threshold):
+            fuzzy_search = self.fuzzy_match.search
+
+        if hasattr(self, "shared_index") and self.shared_index.attach():
+            cosine_search = self.shared_index.search
+            if fuzzy_search and self.shared_index.has_fuzzy:
+                fuzzy_search = self.shared_index.fuzzy_search
+
+        results = cosine_search(keyword, threshold)
+
+        if fuzzy_search:
+            for content in fuzzy_search(keyword, threshold):
                 if not (
                     _ := next(
                         (c for c in results if c.identifier == content.identifier),
@@ -67,6 +90,9 @@ class TextScoring(BaseScoring):
         if hasattr(self, "spell"):
             self.spell.create_dictionary([i.content for i in self._contents])
 
+        if hasattr(self, "shared_index"):
+            self.publish()
+
         return self
 
     def update(self, content: List[Content]) -> "TextScoring":
@@ -76,9 +102,81 @@ class TextScoring(BaseScoring):
 
         if hasattr(self, "spell"):
             self.spell.create_dictionary([i.content for i in content], True)
+
+        if hasattr(self, "shared_index"):
+            self.publish()
+        return self
+
+    def publish(self, fuzzy: Optional[bool] = None) -> "TextScoring":
+        if fuzzy is None:
+            fuzzy = hasattr(self, "fuzzy_match")
+        if hasattr(self, "shared_index"):
+            self.shared_index.publish(fuzzy)
         return self
 
     def add_spell_dictionary(self, dictionary: List[str]) -> "TextScoring":
         if hasattr(self, "spell"):
             self.spell.create_dictionary(dictionary, True)
         return self
+
+    def stats(self) -> IndexStats:
+        resident_memory = self._resident_memory()
+        precision = self.cosine_similarity.stored_precision
+        rows = {}
+        artifacts = {}
+
+        if hasattr(self, "shared_index") and self.shared_index.attach():
+            # read the attached generation, loading the pickles would give
+            # this worker the private copy shared mode avoids.
+            precision = self.shared_index.precision
+            rows["cosine"] = self.cosine_similarity.count_variants(
+                self.shared_index.iter_contents()
+            )
+            if hasattr(self, "fuzzy_match") and self.shared_index.has_fuzzy:
+                rows["fuzzy"] = self.fuzzy_match.count_variants(
+                    self.shared_index.iter_contents("fuzzy")
+                )
+        elif indexs := self.cosine_similarity.get_index():
+            rows["cosine"] = self.cosine_similarity.count_variants(indexs[0])
+            precision = self.cosine_similarity.index_precision(indexs[3])
+
+        if (
+            "fuzzy" not in rows
+            and hasattr(self, "fuzzy_match")
+            and (indexs := self.fuzzy_match.get_index())
+        ):
+            rows["fuzzy"] = self.fuzzy_match.count_variants(indexs)
+
+        for location in self.cosine_similarity.shard_locations():
+            with contextlib.suppress(OSError):
+                artifacts[location] = path.getsize(location)
+
+        for root, _, files in os.walk(self.conf.storage):
+            for name in sorted(files):
+                location = path.join(root, name)
+                with contextlib.suppress(OSError):
+                    artifacts[path.relpath(location, self.conf.storage)] = path.getsize(
+                        location
+                    )
+
+        return IndexStats(
+            collection=self.conf.collection,
+            precision=precision,
+            rows=rows,
+            artifacts=artifacts,
+            resident_memory=resident_memory,
+        )
+
+    @staticmethod
+    def _resident_memory() -> Optional[int]:
+        with contextlib.suppress(OSError, ValueError):
+            with open("/proc/self/statm") as file:
+                return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+        # no procfs, fall back to the peak resident size of the process.
+        with contextlib.suppress(ImportError):
+            import resource
+
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == "darwin" else maxrss * 1024
+        return None
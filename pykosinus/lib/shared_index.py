@@ -0,0 +1,267 @@
+import contextlib
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from os import path
+from typing import Dict, Generator, List, Optional
+
+import numpy as np
+
+from pykosinus import ScoringContent, log
+from pykosinus.lib import BaseScoring
+from pykosinus.lib.compact_index import CompactIndex
+from pykosinus.lib.cosine_similarity import CosineSimilarity
+from pykosinus.lib.fuzzy_match import FuzzyMatch
+
+
+class SharedIndex(BaseScoring):
+    """
+    Read-only index generations shared between processes through mmap'd files.
+
+    A loader process publishes the cosine (and optionally fuzzy) index of a
+    collection as flat numpy arrays and byte buffers. Workers attach to the
+    current generation by collection name, so every worker maps the same
+    pages from the OS page cache instead of unpickling its own copy.
+
+    ``search`` and ``fuzzy_search`` read the generation that is already
+    attached, call ``attach`` once per query so both see the same one.
+    """
+
+    _generation: Optional[str]
+    _arrays: Dict[str, np.ndarray]
+    _postings: CompactIndex
+
+    def __init__(self, collection_name: str, batch_length: Optional[int] = 500) -> None:
+        super().__init__(collection_name, batch_length)
+        self._generation = None
+        self._arrays = {}
+
+    def publish(self, fuzzy: bool = False) -> Optional[str]:
+        st = time.time()
+        collection = self.conf.collection
+        if not (indexs := CosineSimilarity(collection).get_index(True, 10)):
+            return log.warning("SharedIndex.publish cancel, cosine index not found.")
+
+        fuzzy_contents = None
+        if fuzzy and not (fuzzy_contents := FuzzyMatch(collection).get_index()):
+            log.warning(
+                "SharedIndex.publish fuzzy index not found, publishing without it."
+            )
+
+        generation = str(time.time_ns())
+        location = path.join(self.conf.shared_index_location, generation)
+        os.makedirs(location, exist_ok=True)
+
+        scoring_content, dictionary, tfidf, cosine = indexs
+        if not isinstance(cosine, CompactIndex):
+            cosine = CompactIndex.build(
+                (
+                    tfidf[dictionary.doc2bow(content.content.split())]
+                    for content in scoring_content
+                ),
+                len(dictionary),
+            )
+        cosine.save_arrays(path.join(location, "postings"))
+
+        tokens = sorted(dictionary.token2id.items())
+        np.save(
+            path.join(location, "vocab.npy"),
+            np.array([token.encode() for token, _ in tokens], dtype=np.bytes_),
+        )
+        np.save(
+            path.join(location, "vocab.ids.npy"),
+            np.array([term for _, term in tokens], dtype=np.int32),
+        )
+        idfs = np.zeros(len(dictionary), dtype=np.float32)
+        for term, idf in tfidf.idfs.items():
+            idfs[term] = idf
+        np.save(path.join(location, "idfs.npy"), idfs)
+
+        self._write_buffer(
+            path.join(location, "contents"),
+            [self._dump_content(content) for content in scoring_content],
+        )
+        if fuzzy_contents:
+            self._write_buffer(
+                path.join(location, "fuzzy"),
+                [self._dump_content(content) for content in fuzzy_contents],
+            )
+            self._write_buffer(
+                path.join(location, "fuzzy.text"),
+                [content.content.encode() for content in fuzzy_contents],
+            )
+
+        current = path.join(self.conf.shared_index_location, "CURRENT")
+        with open(f"{current}.tmp", "w") as file:
+            file.write(generation)
+        os.replace(f"{current}.tmp", current)
+        self._cleanup(generation)
+        log.debug(
+            f"publish SharedIndex generation {generation} finished in {round(time.time() - st, 3)} seconds."
+        )
+        return generation
+
+    def attach(self) -> bool:
+        generation = None
+        with contextlib.suppress(FileNotFoundError):
+            with open(path.join(self.conf.shared_index_location, "CURRENT")) as file:
+                generation = file.read().strip()
+
+        if not generation:
+            return False
+        if generation == self._generation:
+            return True
+
+        st = time.time()
+        location = path.join(self.conf.shared_index_location, generation)
+        arrays = {}
+        try:
+            postings = CompactIndex.load_arrays(path.join(location, "postings"))
+            for name in (
+                "vocab",
+                "vocab.ids",
+                "idfs",
+                "contents.offsets",
+            ):
+                arrays[name] = np.load(
+                    path.join(location, f"{name}.npy"), mmap_mode="r"
+                )
+            arrays["contents"] = self._map_buffer(path.join(location, "contents.bin"))
+            if path.exists(path.join(location, "fuzzy.bin")):
+                for name in ("fuzzy", "fuzzy.text"):
+                    arrays[f"{name}.offsets"] = np.load(
+                        path.join(location, f"{name}.offsets.npy"), mmap_mode="r"
+                    )
+                    arrays[name] = self._map_buffer(path.join(location, f"{name}.bin"))
+        except (FileNotFoundError, ValueError) as err:
+            log.warning(f"SharedIndex.attach failed for generation {generation}: {err}")
+            return bool(self._generation)
+
+        self._arrays = arrays
+        self._postings = postings
+        self._generation = generation
+        log.debug(
+            f"SharedIndex attach generation {generation} finish in {round(time.time() - st, 3)} seconds."
+        )
+        return True
+
+    @property
+    def has_fuzzy(self) -> bool:
+        return "fuzzy" in self._arrays
+
+    @property
+    def precision(self) -> str:
+        return self._postings.precision
+
+    def iter_contents(
+        self, name: str = "contents"
+    ) -> Generator[ScoringContent, None, None]:
+        for i in range(len(self._arrays[f"{name}.offsets"]) - 1):
+            yield self._load_content(name, i)
+
+    def search(self, keyword: str, threshold: float = 0.4) -> List[ScoringContent]:
+        st = time.time()
+        results: List[ScoringContent] = []
+        if self._generation:
+            self._get_similarity(keyword, threshold, results)
+        log.info(
+            f"got {len(results)} SharedIndex similar contents with keyword '{keyword}' in {round(time.time() - st, 3)} seconds."
+        )
+        return results
+
+    def fuzzy_search(
+        self, keyword: str, threshold: float = 0.5
+    ) -> List[ScoringContent]:
+        results = []
+        st = time.time()
+        if keyword := keyword.lower().replace(" ", ""):
+            if self.has_fuzzy:
+                offsets = self._arrays["fuzzy.text.offsets"]
+                buffer = self._arrays["fuzzy.text"]
+                for i in range(len(offsets) - 1):
+                    text = bytes(buffer[offsets[i] : offsets[i + 1]]).decode()
+                    sim = FuzzyMatch.similarity(keyword, text)
+                    if sim >= threshold:
+                        content = self._load_content("fuzzy", i)
+                        content.score = sim
+                        results.append(content)
+
+        log.info(
+            f"got {len(results)} SharedIndex fuzzy contents with keyword '{keyword}' in {round(time.time() - st, 3)} seconds."
+        )
+        return sorted(results, key=lambda obj: obj.score, reverse=True)
+
+    def _get_similarity(self, keyword, threshold, results):
+        vocab = self._arrays["vocab"]
+        vocab_ids = self._arrays["vocab.ids"]
+        idfs = self._arrays["idfs"]
+
+        terms = []
+        for token in keyword.strip().lower().split():
+            token = token.encode()
+            position = int(np.searchsorted(vocab, token))
+            if position < len(vocab) and vocab[position] == token:
+                terms.append(int(vocab_ids[position]))
+
+        key_vector = {
+            term: tf * float(idfs[term])
+            for term, tf in Counter(terms).items()
+            if idfs[term] > 0
+        }
+        if not (norm := np.sqrt(sum(w * w for w in key_vector.values()))):
+            return
+
+        sims = self._postings[[(term, w / norm) for term, w in key_vector.items()]]
+        for i in np.flatnonzero(sims >= threshold):
+            content = self._load_content("contents", int(i))
+            content.score = float(sims[i])
+            self._merge_best_score(results, content)
+
+    def _load_content(self, name: str, i: int) -> ScoringContent:
+        offsets = self._arrays[f"{name}.offsets"]
+        data = bytes(self._arrays[name][offsets[i] : offsets[i + 1]])
+        identifier, original, content, section = json.loads(data)
+        return ScoringContent(
+            identifier=identifier,
+            original=original,
+            content=content,
+            section=section,
+            score=0,
+        )
+
+    def _cleanup(self, generation: str) -> None:
+        # keep the previous generation, workers may still be attaching to it.
+        generations = sorted(
+            (
+                i
+                for i in os.listdir(self.conf.shared_index_location)
+                if i.isdigit() and i != generation
+            ),
+            key=int,
+        )
+        for old in generations[:-1]:
+            shutil.rmtree(
+                path.join(self.conf.shared_index_location, old), ignore_errors=True
+            )
+
+    @staticmethod
+    def _dump_content(content: ScoringContent) -> bytes:
+        return json.dumps(
+            [content.identifier, content.original, content.content, content.section]
+        ).encode()
+
+    @staticmethod
+    def _write_buffer(location: str, items: List[bytes]) -> None:
+        offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        np.cumsum(np.array([len(i) for i in items], dtype=np.int64), out=offsets[1:])
+        with open(f"{location}.bin", "wb") as file:
+            file.write(b"".join(items))
+        np.save(f"{location}.offsets.npy", offsets)
+
+    @staticmethod
+    def _map_buffer(location: str) -> np.ndarray:
+        if not path.getsize(location):
+            return np.empty(0, dtype=np.uint8)
+        return np.memmap(location, dtype=np.uint8, mode="r")